@@ -0,0 +1,396 @@
+"""Tablas derivadas que mantienen los triggers y su reconstrucción desde las tablas de origen.
+
+Está fuera de app.py para que las herramientas de línea de comandos verifiquen y reconstruyan
+sobre una conexión sqlite3 común, sin levantar Streamlit. Cada función corre dentro de la
+transacción del que llama (migración, botón de ⚡ RENDIMIENTO o herramienta) y no hace commit.
+"""
+import re
+import sqlite3
+
+# ------------------------------
+# KPIs del tablero (kpi_snapshot / kpi_stock_rubros)
+# ------------------------------
+# Una fila (kpi_snapshot) más el stock por rubro (kpi_stock_rubros), mantenidas por triggers en cada
+# escritura de flota, stock, mantenimientos y combustible. El dashboard lee eso en vez de sumar las
+# tablas enteras. reconstruir_kpis() recalcula todo desde cero para corregir un desvío.
+KPI_COLUMNAS = [
+    "unidades", "alertas_vencidas", "valor_stock", "stock_total",
+    "gasto_taller", "gasto_combustible", "ots_pendientes",
+]
+
+# Aporte de una fila a cada KPI; "{f}" es NEW u OLD en los triggers y la tabla en el recálculo.
+_KPI_VENCIDO = (
+    "(CASE WHEN COALESCE({f}.km_actual, 0) - COALESCE({f}.km_ultimo_service, 0)"
+    " >= COALESCE(NULLIF({f}.km_service_interval, 0), 15000) THEN 1 ELSE 0 END)"
+)
+_KPI_VALOR = "(CASE WHEN {f}.cantidad IS NOT NULL AND {f}.precio IS NOT NULL THEN {f}.cantidad * {f}.precio ELSE 0 END)"
+_KPI_PENDIENTE = "COALESCE({f}.estado != 'Cerrada', 0)"
+_KPI_CON_RUBRO = "{f}.rubro IS NOT NULL AND {f}.rubro != '' AND {f}.cantidad IS NOT NULL"
+
+# tabla -> {columna KPI: aporte de una fila}
+_KPI_APORTES = {
+    "flota": {"unidades": "1", "alertas_vencidas": _KPI_VENCIDO},
+    "stock": {"valor_stock": _KPI_VALOR, "stock_total": "COALESCE({f}.cantidad, 0)"},
+    "mantenimientos": {"gasto_taller": "COALESCE({f}.costo_total, 0)", "ots_pendientes": _KPI_PENDIENTE},
+    "combustible": {"gasto_combustible": "COALESCE({f}.costo, 0)"},
+}
+# columnas que mueven algún KPI: un UPDATE que no toca ninguna no dispara el trigger
+_KPI_COLUMNAS_FUENTE = {
+    "flota": "km_actual, km_ultimo_service, km_service_interval",
+    "stock": "cantidad, precio, rubro",
+    "mantenimientos": "costo_total, estado",
+    "combustible": "costo",
+}
+
+
+def crear_triggers_kpis(conn):
+    for tabla, aportes in _KPI_APORTES.items():
+        for evento in ("INSERT", "UPDATE", "DELETE"):
+            sets = []
+            for col, aporte in aportes.items():
+                delta = {
+                    "INSERT": aporte.format(f="NEW"),
+                    "DELETE": f"- {aporte.format(f='OLD')}",
+                    "UPDATE": f"{aporte.format(f='NEW')} - {aporte.format(f='OLD')}",
+                }[evento]
+                sets.append(f"{col} = {col} + ({delta})")
+            cuerpo = f"UPDATE kpi_snapshot SET {', '.join(sets)}, actualizado = datetime('now', 'localtime') WHERE id = 1;"
+            if tabla == "stock":
+                if evento in ("UPDATE", "DELETE"):
+                    cuerpo += f"""
+                        UPDATE kpi_stock_rubros SET articulos = articulos - 1, total_cantidad = total_cantidad - OLD.cantidad
+                        WHERE rubro = OLD.rubro AND {_KPI_CON_RUBRO.format(f='OLD')};"""
+                if evento in ("UPDATE", "INSERT"):
+                    cuerpo += f"""
+                        INSERT INTO kpi_stock_rubros (rubro, articulos, total_cantidad)
+                        SELECT NEW.rubro, 1, NEW.cantidad WHERE {_KPI_CON_RUBRO.format(f='NEW')}
+                        ON CONFLICT(rubro) DO UPDATE SET articulos = articulos + 1,
+                            total_cantidad = total_cantidad + excluded.total_cantidad;"""
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_kpi_{tabla}_{evento.lower()}")
+            conn.execute(
+                f"""CREATE TRIGGER trg_kpi_{tabla}_{evento.lower()}
+                    AFTER {evento}{' OF ' + _KPI_COLUMNAS_FUENTE[tabla] if evento == 'UPDATE' else ''} ON {tabla} BEGIN
+                        {cuerpo}
+                    END"""
+            )
+
+
+def _kpi_calcular(conn) -> dict:
+    """Los KPIs recalculados desde las tablas (lo que el snapshot debería tener)."""
+    valores = {}
+    for tabla, aportes in _KPI_APORTES.items():
+        sumas = ", ".join(f"COALESCE(SUM({aporte.format(f=tabla)}), 0)" for aporte in aportes.values())
+        fila = conn.execute(f"SELECT {sumas} FROM {tabla}").fetchone()
+        valores.update(zip(aportes, fila))
+    return valores
+
+
+def iguales(a, b) -> bool:
+    # los importes se acumulan de a un trigger por vez: se tolera el redondeo de punto flotante
+    return abs((a or 0) - (b or 0)) <= 0.005 + 1e-9 * abs(b or 0)
+
+
+def reconstruir_kpis(conn) -> dict:
+    """Recalcula kpi_snapshot y kpi_stock_rubros desde cero. Devuelve {kpi: (antes, ahora)} de lo
+    que estaba desviado."""
+    antes = conn.execute(f"SELECT {', '.join(KPI_COLUMNAS)} FROM kpi_snapshot WHERE id = 1").fetchone()
+    valores = _kpi_calcular(conn)
+    conn.execute(
+        f"""INSERT OR REPLACE INTO kpi_snapshot (id, {', '.join(KPI_COLUMNAS)}, actualizado, reconstruido)
+            VALUES (1, {', '.join('?' * len(KPI_COLUMNAS))}, datetime('now', 'localtime'), datetime('now', 'localtime'))""",
+        [valores[c] for c in KPI_COLUMNAS],
+    )
+    conn.execute("DELETE FROM kpi_stock_rubros")
+    conn.execute(
+        f"""INSERT INTO kpi_stock_rubros (rubro, articulos, total_cantidad)
+            SELECT rubro, COUNT(*), SUM(cantidad) FROM stock WHERE {_KPI_CON_RUBRO.format(f='stock')} GROUP BY rubro"""
+    )
+    if antes is None:
+        return {}
+    return {c: (a, valores[c]) for c, a in zip(KPI_COLUMNAS, antes) if not iguales(a, valores[c])}
+
+
+def desvio_kpis(conn) -> dict:
+    """{kpi: (snapshot, real)} de los KPIs cuyo snapshot no coincide con las tablas (sin corregir nada)."""
+    fila = conn.execute(f"SELECT {', '.join(KPI_COLUMNAS)} FROM kpi_snapshot WHERE id = 1").fetchone()
+    valores = _kpi_calcular(conn)
+    fila = fila or (None,) * len(KPI_COLUMNAS)
+    return {c: (a, valores[c]) for c, a in zip(KPI_COLUMNAS, fila) if a is None or not iguales(a, valores[c])}
+
+
+# ------------------------------
+# Saldo de cubiertas por modelo (cubiertas_saldo)
+# ------------------------------
+# Cada ENTRADA/SALIDA de cubiertas_movimientos suma o resta en la misma transacción del INSERT.
+# reconciliar_cubiertas() lo reconstruye desde el historial.
+CUBIERTAS_SALDO_COLUMNAS = ["entradas", "salidas", "stock", "valor_compras", "cantidad_valorizada"]
+
+_CUB_APORTES = {
+    "entradas": "CASE WHEN {f}.tipo_movimiento = 'ENTRADA' THEN COALESCE({f}.cantidad, 0) ELSE 0 END",
+    "salidas": "CASE WHEN {f}.tipo_movimiento = 'SALIDA' THEN COALESCE({f}.cantidad, 0) ELSE 0 END",
+    "stock": "CASE WHEN {f}.tipo_movimiento = 'ENTRADA' THEN 1 ELSE -1 END * COALESCE({f}.cantidad, 0)",
+    "valor_compras": (
+        "CASE WHEN {f}.tipo_movimiento = 'ENTRADA' AND {f}.precio_unitario IS NOT NULL"
+        " THEN COALESCE({f}.cantidad, 0) * {f}.precio_unitario ELSE 0 END"
+    ),
+    "cantidad_valorizada": (
+        "CASE WHEN {f}.tipo_movimiento = 'ENTRADA' AND {f}.precio_unitario IS NOT NULL"
+        " THEN COALESCE({f}.cantidad, 0) ELSE 0 END"
+    ),
+}
+
+
+def _cub_sumar(f, signo):
+    """UPSERT que suma (signo '+') o resta (signo '-') el movimiento f (NEW/OLD) al saldo."""
+    aportes = ", ".join(f"{signo}({a.format(f=f)})" for a in _CUB_APORTES.values())
+    sets = ", ".join(f"{c} = {c} + excluded.{c}" for c in CUBIERTAS_SALDO_COLUMNAS)
+    return f"""
+        INSERT INTO cubiertas_saldo (marca, modelo, {', '.join(CUBIERTAS_SALDO_COLUMNAS)})
+        SELECT COALESCE({f}.marca, ''), COALESCE({f}.modelo, ''), {aportes}
+        WHERE {f}.tipo_movimiento IN ('ENTRADA', 'SALIDA')
+        ON CONFLICT(marca, modelo) DO UPDATE SET {sets},
+            precio_promedio = (valor_compras + excluded.valor_compras)
+                              / NULLIF(cantidad_valorizada + excluded.cantidad_valorizada, 0);"""
+
+
+def crear_triggers_cubiertas(conn):
+    cuerpos = {
+        "INSERT": _cub_sumar("NEW", "+"),
+        "UPDATE": _cub_sumar("OLD", "-") + _cub_sumar("NEW", "+"),
+        "DELETE": _cub_sumar("OLD", "-"),
+    }
+    for evento, cuerpo in cuerpos.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_cubiertas_saldo_{evento.lower()}")
+        conn.execute(
+            f"""CREATE TRIGGER trg_cubiertas_saldo_{evento.lower()}
+                AFTER {evento} ON cubiertas_movimientos BEGIN
+                    {cuerpo}
+                END"""
+        )
+
+
+def _cub_calcular(conn) -> dict:
+    """(marca, modelo) -> valores del saldo recalculados desde cubiertas_movimientos."""
+    sumas = ", ".join(f"SUM({a.format(f='m')})" for a in _CUB_APORTES.values())
+    filas = conn.execute(
+        f"""SELECT COALESCE(m.marca, '') AS marca_saldo, COALESCE(m.modelo, '') AS modelo_saldo, {sumas}
+            FROM cubiertas_movimientos m
+            WHERE m.tipo_movimiento IN ('ENTRADA', 'SALIDA')
+            GROUP BY marca_saldo, modelo_saldo"""
+    ).fetchall()
+    return {(f[0], f[1]): f[2:] for f in filas}
+
+
+def _cub_diferencias(conn, real: dict) -> list:
+    actual = {
+        (f[0], f[1]): f[2:]
+        for f in conn.execute(f"SELECT marca, modelo, {', '.join(CUBIERTAS_SALDO_COLUMNAS)} FROM cubiertas_saldo")
+    }
+    vacio = (0,) * len(CUBIERTAS_SALDO_COLUMNAS)
+    diferencias = []
+    for clave in sorted(set(actual) | set(real)):
+        a, b = actual.get(clave, vacio), real.get(clave, vacio)
+        if any(not iguales(x, y) for x, y in zip(a, b)):
+            diferencias.append({"marca": clave[0], "modelo": clave[1], "stock_saldo": a[2], "stock_real": b[2]})
+    return diferencias
+
+
+def reconciliar_cubiertas(conn) -> list:
+    """Reconstruye cubiertas_saldo desde el historial. Devuelve los modelos que estaban desviados."""
+    real = _cub_calcular(conn)
+    diferencias = _cub_diferencias(conn, real)
+    conn.execute("DELETE FROM cubiertas_saldo")
+    conn.executemany(
+        f"""INSERT INTO cubiertas_saldo (marca, modelo, {', '.join(CUBIERTAS_SALDO_COLUMNAS)}, precio_promedio)
+            VALUES (?, ?, {', '.join('?' * len(CUBIERTAS_SALDO_COLUMNAS))}, ?)""",
+        [(*clave, *v, v[3] / v[4] if v[4] else None) for clave, v in real.items()],
+    )
+    return diferencias
+
+
+def desvio_cubiertas(conn) -> list:
+    """Modelos cuyo saldo no coincide con el historial de movimientos (sin corregir nada)."""
+    return _cub_diferencias(conn, _cub_calcular(conn))
+
+
+# ------------------------------
+# Estado de cada cubierta por Nº de fuego (neumaticos / neumaticos_eventos)
+# ------------------------------
+# Cada movimiento se aplica en la misma transacción en que se graba (aplicar_movimiento_neumaticos)
+# y reconstruir_neumaticos() lo rearma repasando el historial en orden.
+NEUMATICOS_EVENTOS = ("SALIDA", "DESMONTAJE", "RECAPADO", "BAJA")
+
+
+def fuegos(nro_interno, cantidad=None) -> list:
+    """Números de fuego de un movimiento: "463-464" con 2 cubiertas son la 463 y la 464; "463-466"
+    con 4 es el rango; "463, 470" son esas dos. Sin números, lista vacía."""
+    numeros = re.findall(r"\d+", str(nro_interno or ""))
+    if len(numeros) == 2 and cantidad and cantidad > 2:
+        a, b = int(numeros[0]), int(numeros[1])
+        if b - a + 1 == cantidad:
+            return [str(n) for n in range(a, b + 1)]
+    return list(dict.fromkeys(numeros))
+
+
+def aplicar_movimiento_neumaticos(conn, mov: dict):
+    """Aplica un movimiento de cubiertas_movimientos (dict con sus columnas) al estado por fuego.
+    SALIDA monta; DESMONTAJE/RECAPADO/BAJA llevan el Nº de fuego en nro_interno y el km del
+    camión al desmontar en kilometraje_colocacion."""
+    tipo = mov.get("tipo_movimiento")
+    if tipo not in NEUMATICOS_EVENTOS:
+        return
+    km = mov.get("kilometraje_colocacion") or None
+    for codigo in fuegos(mov.get("nro_interno"), mov.get("cantidad")):
+        previo = conn.execute(
+            "SELECT estado, ubicacion_movil, km_instalacion, vida FROM neumaticos WHERE codigo = ?", (codigo,)
+        ).fetchone()
+        vida = (previo[3] if previo else None) or 1
+        montada_en = previo[1] if previo and previo[0] == "Montada" else None
+        if montada_en and (tipo != "SALIDA" or montada_en != mov.get("destino_camion")):
+            # desmontaje (explícito o porque aparece montada en otro camión): suma los km hechos. Si no
+            # se registró el desmontaje, el km del camión anterior es el último que tiene la flota
+            km_baja = km
+            if tipo == "SALIDA":
+                fila = conn.execute("SELECT km_actual FROM flota WHERE nombre_movil = ?", (montada_en,)).fetchone()
+                km_baja = fila[0] if fila else None
+            recorridos = (km_baja - previo[2]) if km_baja and previo[2] is not None else 0
+            conn.execute(
+                """UPDATE neumaticos SET estado = 'En depósito', ubicacion_movil = NULL, posicion = NULL,
+                       km_acumulados = COALESCE(km_acumulados, 0) + ? WHERE codigo = ?""",
+                (max(0, recorridos), codigo),
+            )
+            if tipo == "SALIDA":
+                conn.execute(
+                    """INSERT INTO neumaticos_eventos (codigo, movimiento_id, fecha, evento, movil, km, vida)
+                       VALUES (?, ?, ?, 'DESMONTAJE', ?, ?, ?)""",
+                    (codigo, mov["id"], mov.get("fecha"), montada_en, km_baja, vida),
+                )
+        if tipo == "SALIDA":
+            # costo de compra: precio promedio ponderado del modelo (sólo la primera vez)
+            precio = conn.execute(
+                "SELECT precio_promedio FROM cubiertas_saldo WHERE marca = ? AND modelo = ?",
+                (mov.get("marca") or "", mov.get("modelo") or ""),
+            ).fetchone()
+            conn.execute(
+                """INSERT INTO neumaticos (codigo, marca, modelo, estado, ubicacion_movil, posicion, km_instalacion,
+                                           fecha_instalacion, vida, km_acumulados, costo, movimiento_id)
+                   VALUES (?, ?, ?, 'Montada', ?, ?, ?, ?, 1, 0, ?, ?)
+                   ON CONFLICT(codigo) DO UPDATE SET
+                       marca = COALESCE(excluded.marca, marca), modelo = COALESCE(excluded.modelo, modelo),
+                       estado = 'Montada', ubicacion_movil = excluded.ubicacion_movil, posicion = excluded.posicion,
+                       km_instalacion = excluded.km_instalacion, fecha_instalacion = excluded.fecha_instalacion,
+                       costo = COALESCE(costo, excluded.costo), movimiento_id = excluded.movimiento_id""",
+                (codigo, mov.get("marca"), mov.get("modelo"), mov.get("destino_camion"), mov.get("ubicacion_posicion"),
+                 km, mov.get("fecha"), precio[0] if precio else None, mov["id"]),
+            )
+        elif previo is None:
+            continue  # desmontaje/recapado de un fuego que nunca se montó: nada que actualizar
+        elif tipo == "RECAPADO":
+            vida += 1
+            conn.execute(
+                """UPDATE neumaticos SET vida = ?, costo = COALESCE(costo, 0) + ?, movimiento_id = ?
+                   WHERE codigo = ?""",
+                (vida, mov.get("precio_unitario") or 0, mov["id"], codigo),
+            )
+        elif tipo == "BAJA":
+            conn.execute("UPDATE neumaticos SET estado = 'Baja', movimiento_id = ? WHERE codigo = ?", (mov["id"], codigo))
+        else:
+            conn.execute("UPDATE neumaticos SET movimiento_id = ? WHERE codigo = ?", (mov["id"], codigo))
+        conn.execute(
+            """INSERT INTO neumaticos_eventos (codigo, movimiento_id, fecha, evento, movil, posicion, km, vida)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (codigo, mov["id"], mov.get("fecha"), "MONTAJE" if tipo == "SALIDA" else tipo,
+             mov.get("destino_camion") if tipo == "SALIDA" else montada_en,
+             mov.get("ubicacion_posicion") if tipo == "SALIDA" else None, km, vida),
+        )
+
+
+def reconstruir_neumaticos(conn) -> int:
+    """Rearma neumaticos/neumaticos_eventos repasando cubiertas_movimientos en orden. Las filas de
+    neumaticos cargadas a mano (sin movimiento_id) se conservan. Devuelve cuántos movimientos aplicó."""
+    conn.execute("DELETE FROM neumaticos_eventos")
+    conn.execute("DELETE FROM neumaticos WHERE movimiento_id IS NOT NULL")
+    cur = conn.execute(
+        f"""SELECT * FROM cubiertas_movimientos
+            WHERE tipo_movimiento IN ({', '.join('?' * len(NEUMATICOS_EVENTOS))})
+              AND COALESCE(nro_interno, '') != ''
+            ORDER BY id""",
+        NEUMATICOS_EVENTOS,
+    )
+    columnas = [d[0] for d in cur.description]
+    movimientos = [dict(zip(columnas, fila)) for fila in cur.fetchall()]
+    for mov in movimientos:
+        aplicar_movimiento_neumaticos(conn, mov)
+    return len(movimientos)
+
+
+# ------------------------------
+# Buscador rápido (busqueda, FTS5 de trigramas)
+# ------------------------------
+# Un documento por OT, tarea estándar, artículo de stock, proveedor y móvil, mantenido por triggers.
+# rowid = id * 8 + código del tipo, así los triggers reemplazan y borran por rowid. Los trigramas
+# encuentran subcadenas ("filt" -> "FILTRO DE AIRE") y, unidos con OR, también texto mal tipeado.
+# Los acentos se sacan al indexar en SQL: un trigger no puede llamar a Python (la base también la
+# tocan las herramientas).
+# tipo: (código, tabla, columnas del título, columnas del texto); "{f}" es NEW/OLD o la tabla.
+BUSQUEDA_TIPOS = {
+    "ot": (1, "mantenimientos", ["'OT #' || {f}.id", "fecha", "descripcion"],
+           ["observaciones", "categoria", "responsable", "nombre_taller_externo"]),
+    "tarea": (2, "tareas_estandar", ["nombre"], []),
+    "stock": (3, "stock", ["nombre"], ["codigo", "rubro", "categoria", "proveedor"]),
+    "proveedor": (4, "proveedores", ["empresa"], ["contacto", "rubro", "telefono"]),
+    "movil": (5, "flota", ["nombre_movil", "patente"], ["modelo", "tipo"]),
+}
+_BUSQUEDA_ACENTOS = {"á": "a", "é": "e", "í": "i", "ó": "o", "ú": "u", "ü": "u", "ñ": "n"}
+
+
+def _busqueda_texto(columnas, f, separador):
+    partes = [c.format(f=f) if "{f}" in c else f"COALESCE({f}.{c}, '')" for c in columnas] or ["''"]
+    return f" || '{separador}' || ".join(partes)
+
+
+def _sin_acentos(expr):
+    for con, sin in _BUSQUEDA_ACENTOS.items():
+        expr = f"replace(replace({expr}, '{con}', '{sin}'), '{con.upper()}', '{sin.upper()}')"
+    return expr
+
+
+def _busqueda_fila(tipo, f):
+    """(rowid, titulo, texto, etiqueta) del documento de la fila f como expresiones SQL."""
+    codigo, _tabla, titulo, texto = BUSQUEDA_TIPOS[tipo]
+    etiqueta = _busqueda_texto(titulo, f, " · ")
+    return f"{f}.id * 8 + {codigo}", _sin_acentos(etiqueta), _sin_acentos(_busqueda_texto(texto, f, " ")), etiqueta
+
+
+def crear_busqueda(conn) -> bool:
+    """Crea la tabla del buscador y sus triggers. False si este SQLite no tiene FTS5 con trigramas
+    (3.34 o posterior): el buscador de la app usa LIKE hasta que se cree."""
+    try:
+        # etiqueta: el título tal cual (con acentos) para mostrar; no se indexa
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5(titulo, texto, etiqueta UNINDEXED, tokenize = 'trigram')"
+        )
+    except sqlite3.OperationalError:
+        return False
+    for tipo, (codigo, tabla, titulo, texto) in BUSQUEDA_TIPOS.items():
+        columnas = ", ".join(c for c in titulo + texto if "{f}" not in c)
+        borrar = f"DELETE FROM busqueda WHERE rowid = OLD.id * 8 + {codigo};"
+        insertar = "INSERT INTO busqueda (rowid, titulo, texto, etiqueta) VALUES ({});".format(", ".join(_busqueda_fila(tipo, "NEW")))
+        for evento, cuerpo in (("INSERT", insertar), (f"UPDATE OF id, {columnas}", borrar + insertar), ("DELETE", borrar)):
+            nombre = f"trg_busqueda_{tabla}_{evento.split()[0].lower()}"
+            conn.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+            conn.execute(f"CREATE TRIGGER {nombre} AFTER {evento} ON {tabla} BEGIN {cuerpo} END")
+    return True
+
+
+def reconstruir_busqueda(conn) -> int:
+    """Rearma el índice del buscador desde las tablas. Devuelve cuántos documentos indexó."""
+    conn.execute("DELETE FROM busqueda")
+    for tipo, (_codigo, tabla, _titulo, _texto) in BUSQUEDA_TIPOS.items():
+        conn.execute(
+            "INSERT INTO busqueda (rowid, titulo, texto, etiqueta) SELECT {} FROM {}".format(
+                ", ".join(_busqueda_fila(tipo, tabla)), tabla
+            )
+        )
+    conn.execute("INSERT INTO busqueda (busqueda) VALUES ('optimize')")
+    return conn.execute("SELECT COUNT(*) FROM busqueda").fetchone()[0]
@@ -0,0 +1,179 @@
+"""Benchmark de páginas de la app contra una base (p. ej. una generada con generar_db_sintetica.py).
+
+Corre cada página headless con AppTest (mismas consultas y mismo post-proceso de pandas que
+en producción) y reporta por página: tiempo de rerun (mediana/mín/máx), tiempo en SQLite,
+tiempo armando DataFrames, filas mandadas al navegador y pico de memoria. Los tiempos de
+DB/DataFrame salen de la medición que la app ya hace en cada rerun (MedicionRerun).
+
+Con --baseline compara contra una corrida guardada y termina con código 1 si alguna página
+empeoró más de --tolerancia.
+
+Uso (desde la raíz del repo):
+
+    python herramientas/benchmark.py flota_grande.db --guardar benchmark_base.json
+    python herramientas/benchmark.py flota_grande.db --baseline benchmark_base.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import closing
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: E402
+
+TABLAS_CONTADAS = ["flota", "mantenimientos", "ot_tareas", "kardex", "combustible", "cubiertas_movimientos", "stock"]
+PAGINA_OPERARIO = "TALLER_OPERARIO"
+UMBRAL_MINIMO_MS = 20  # diferencias menores a esto son ruido aunque el porcentaje sea alto
+
+
+def _tamanios(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        out = {}
+        for tabla in TABLAS_CONTADAS:
+            try:
+                out[tabla] = conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+            except sqlite3.Error:
+                out[tabla] = None
+        return out
+
+
+def _medir(at, repeticiones):
+    """Reruns de la página actual: lista de (wall_ms, db_ms, df_ms, filas, secciones, errores)."""
+    corridas = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        at.run()
+        wall = (time.perf_counter() - t0) * 1000
+        medicion = at.session_state["_medicion_rerun"] if "_medicion_rerun" in at.session_state else None
+        corridas.append((
+            wall,
+            medicion.db_ms if medicion else 0.0,
+            medicion.df_ms if medicion else 0.0,
+            medicion.filas_enviadas if medicion else 0,
+            {s[0]: round(s[1], 1) for s in medicion.secciones} if medicion else {},
+            comun.errores(at),
+        ))
+    return corridas
+
+
+def _pico_memoria_mb(at):
+    tracemalloc.start()
+    try:
+        at.run()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def correr(db_path, repeticiones=3, paginas=None):
+    comun.compilar_una_vez()  # como en el servidor: sin recompilar app.py en cada rerun
+    resultados = {}
+    admin = comun.nueva_sesion(db_path, "admin")
+    admin.run()  # calentamiento: migraciones, pool, caches de referencia
+    radio = comun.radio_navegacion(admin)
+    objetivos = [("admin", p) for p in (radio.options if radio else [])] + [("Chiro", PAGINA_OPERARIO)]
+    if paginas:
+        objetivos = [(u, p) for u, p in objetivos if p in paginas]
+
+    operario = None
+    for usuario, pagina in objetivos:
+        if usuario == "admin":
+            at = admin
+            comun.radio_navegacion(at).set_value(pagina)
+        else:
+            at = operario = operario or comun.nueva_sesion(db_path, usuario)
+        at.run()  # primera visita a la página (no se cuenta)
+        corridas = _medir(at, repeticiones)
+        walls = [c[0] for c in corridas]
+        resultados[pagina] = {
+            "usuario": usuario,
+            "wall_ms_p50": round(statistics.median(walls), 1),
+            "wall_ms_min": round(min(walls), 1),
+            "wall_ms_max": round(max(walls), 1),
+            "db_ms": round(statistics.median(c[1] for c in corridas), 1),
+            "df_ms": round(statistics.median(c[2] for c in corridas), 1),
+            "filas_enviadas": corridas[-1][3],
+            "secciones_ms": corridas[-1][4],
+            "pico_mb": round(_pico_memoria_mb(at), 1),
+            "errores": corridas[-1][5][:3],
+        }
+        r = resultados[pagina]
+        print(
+            f"  {pagina:<28} p50 {r['wall_ms_p50']:>9.1f} ms  db {r['db_ms']:>8.1f}  df {r['df_ms']:>8.1f}  "
+            f"filas {r['filas_enviadas']:>7}  pico {r['pico_mb']:>7.1f} MB"
+            + (f"  ❌ {r['errores'][0]}" if r["errores"] else "")
+        )
+    return resultados
+
+
+def comparar(actual, base, tolerancia):
+    """Páginas que empeoraron: [(pagina, base_ms, actual_ms, ratio)]."""
+    peores = []
+    for pagina, r in actual.items():
+        b = base.get(pagina)
+        if not b:
+            continue
+        antes, ahora = b["wall_ms_p50"], r["wall_ms_p50"]
+        if ahora - antes > UMBRAL_MINIMO_MS and ahora > antes * (1 + tolerancia):
+            peores.append((pagina, antes, ahora, ahora / antes if antes else float("inf")))
+    return peores
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("db", help="archivo .db a medir")
+    ap.add_argument("--repeticiones", type=int, default=3)
+    ap.add_argument("--pagina", action="append", help="medir sólo esta página (se puede repetir)")
+    ap.add_argument("--guardar", help="guardar resultados como JSON (sirve de baseline)")
+    ap.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    ap.add_argument("--tolerancia", type=float, default=0.20, help="empeoramiento aceptado (0.20 = 20%%)")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        ap.error(f"{args.db} no existe")
+    tamanios = _tamanios(args.db)
+    print(f"📊 {args.db}: " + ", ".join(f"{t}={n:,}" for t, n in tamanios.items() if n is not None))
+    resultados = correr(args.db, args.repeticiones, args.pagina)
+
+    salida = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "db": os.path.basename(args.db),
+        "tamanios": tamanios,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "paginas": resultados,
+    }
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(salida, f, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados guardados en {args.guardar}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+        if base.get("tamanios") != tamanios:
+            print("⚠️ La baseline se tomó sobre una base de otro tamaño: la comparación es orientativa")
+        print(f"\nComparación contra {args.baseline} ({base.get('fecha')}):")
+        for pagina, r in resultados.items():
+            b = base["paginas"].get(pagina)
+            if b:
+                print(f"  {pagina:<28} {b['wall_ms_p50']:>9.1f} → {r['wall_ms_p50']:>9.1f} ms")
+        peores = comparar(resultados, base["paginas"], args.tolerancia)
+        if peores:
+            print(f"\n❌ {len(peores)} página(s) más lentas que la baseline (+{int(args.tolerancia * 100)}%):")
+            for pagina, antes, ahora, ratio in peores:
+                print(f"  {pagina}: {antes:.1f} → {ahora:.1f} ms (x{ratio:.2f})")
+            return 1
+        print("\n✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
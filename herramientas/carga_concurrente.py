@@ -0,0 +1,259 @@
+"""Prueba de carga: N sesiones simultáneas de la app contra un mismo archivo SQLite.
+
+Cada usuario virtual es un AppTest en su propio hilo, todos en el mismo proceso (como las
+sesiones de un único servidor Streamlit: comparten el pool de conexiones y el escritor).
+Los administradores navegan secciones, eligen y cierran OTs en Gestión de Pendientes y registran
+entradas/salidas de stock; los operarios (Chiro) crean OTs en TALLER_OPERARIO.
+
+Reporta por acción la latencia de rerun (p50/p95/p99/máx), la espera por el escritor
+(medida por la app en cada rerun), la tasa de errores y las escrituras confirmadas por
+segundo, para dimensionar cuántas tablets de taller aguanta un servidor.
+
+Uso (desde la raíz del repo, sobre una COPIA de la base: la prueba escribe):
+
+    python herramientas/carga_concurrente.py copia.db --usuarios 8 --duracion 60
+    python herramientas/carga_concurrente.py copia.db --usuarios 16 --admins 4 --pausa 0.5 --csv carga.csv
+"""
+import argparse
+import csv
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import comun  # noqa: E402
+
+PAGINA_TALLER = "🔧 TALLER & OTS"
+PAGINA_STOCK = "📦 STOCK VISUAL"
+
+
+class UsuarioVirtual(threading.Thread):
+    def __init__(self, n, usuario, db_path, fin, pausa, semilla):
+        super().__init__(name=f"{usuario}-{n}", daemon=True)
+        self.usuario = usuario
+        self.db_path = db_path
+        self.fin = fin
+        self.pausa = pausa
+        self.rnd = random.Random(semilla)
+        self.muestras = []  # (usuario, accion, wall_ms, espera_escritor_ms, error)
+        self.at = None
+
+    # --- un rerun medido ---
+    def _rerun(self, accion, paso=None):
+        at = self.at
+        t0 = time.perf_counter()
+        error = ""
+        try:
+            (paso or at.run)()
+            errores = comun.errores(at)
+            if errores:
+                error = str(errores[0])[:200]
+        except Exception as e:  # timeout de AppTest, etc.
+            error = f"{type(e).__name__}: {e}"[:200]
+        wall = (time.perf_counter() - t0) * 1000
+        medicion = at.session_state["_medicion_rerun"] if "_medicion_rerun" in at.session_state else None
+        espera = medicion.espera_escritor_ms if medicion is not None else 0.0
+        self.muestras.append((self.usuario, accion, wall, espera, error))
+        return not error
+
+    # --- acciones del administrador ---
+    def _ir_a(self, pagina):
+        radio = comun.radio_navegacion(self.at)
+        if radio is None:
+            return False
+        return self._rerun(f"navegar {pagina}", lambda: radio.set_value(pagina).run())
+
+    def navegar(self):
+        radio = comun.radio_navegacion(self.at)
+        if radio is not None:
+            self._ir_a(self.rnd.choice(radio.options))
+
+    def cerrar_ot(self):
+        if not self._ir_a(PAGINA_TALLER):
+            return
+        # los widgets de cierre sólo existen para la OT elegida en la cola
+        cola = [s for s in self.at.selectbox if s.key == "pend_ot_sel"]
+        if not cola or not cola[0].options:
+            return
+        cola[0].set_value(int(self.rnd.choice(cola[0].options).split(" - ")[0][len("OT #"):]))
+        if not self._rerun("elegir OT"):
+            return
+        botones = [b for b in self.at.button if (b.key or "").startswith("cerrar_ot_")]
+        if not botones:
+            return
+        self._rerun("cerrar OT", lambda: botones[0].click().run())
+
+    def movimiento_stock(self):
+        if not self._ir_a(PAGINA_STOCK):
+            return
+        tabla = [d for d in self.at.dataframe if getattr(d, "key", None) == "tabla_stock_main"]
+        n_filas = len(tabla[0].value) if tabla else 0
+        if not n_filas:
+            return
+        at = self.at
+        fila = self.rnd.randrange(n_filas)
+
+        def elegir():
+            # la selección de una tabla no es un widget que AppTest conserve entre runs: se repite
+            at.session_state["tabla_stock_main"] = {"selection": {"rows": [fila], "columns": []}}
+
+        elegir()
+        if not self._rerun("elegir artículo"):
+            return
+        salida = [b for b in at.button if (b.key or "").startswith("btn_out_")]
+        if salida and self.rnd.random() < 0.5:
+            art = salida[0].key[len("btn_out_"):]
+            at.radio(key=f"radio_tipo_{art}").set_value("🏢 Uso Interno")
+            elegir()
+            if not self._rerun("preparar salida"):
+                return
+            claves = {t.key for t in at.text_input}
+            if f"text_uso_{art}" not in claves or f"resp_{art}" not in claves:
+                return
+            at.text_input(key=f"text_uso_{art}").input("Prueba de carga")
+            at.text_input(key=f"resp_{art}").input(self.name)
+            elegir()
+            self._rerun("salida de stock", lambda: at.button(key=f"btn_out_{art}").click().run())
+        else:
+            entrada = [b for b in at.button if b.label == "🟢 Confirmar Entrada"]
+            if entrada:
+                elegir()
+                self._rerun("entrada de stock", lambda: entrada[0].click().run())
+
+    # --- acciones del operario ---
+    def crear_ot(self):
+        at = self.at
+        tareas = [s for s in at.selectbox if s.key == "sel_multi_op"]
+        if not tareas or not tareas[0].options:
+            return
+        tareas[0].set_value(self.rnd.choice(tareas[0].options))
+        agregar = [b for b in at.button if b.label == "➕ Agregar"]
+        if not agregar or not self._rerun("agregar tarea", lambda: agregar[0].click().run()):
+            return
+        moviles = [s for s in at.selectbox if s.label == "Móvil"]
+        if moviles and moviles[0].options:
+            moviles[0].set_value(self.rnd.choice(moviles[0].options))
+        crear = [b for b in at.button if b.label == "🚀 Crear Orden de Trabajo"]
+        if crear:
+            self._rerun("crear OT", lambda: crear[0].click().run())
+
+    def run(self):
+        self.at = comun.nueva_sesion(self.db_path, self.usuario)
+        self._rerun("login")
+        if self.usuario == "admin":
+            acciones = [(self.navegar, 0.5), (self.cerrar_ot, 0.25), (self.movimiento_stock, 0.25)]
+        else:
+            acciones = [(self.crear_ot, 0.7), (lambda: self._rerun("refrescar"), 0.3)]
+        while time.monotonic() < self.fin:
+            accion = self.rnd.choices([a for a, _ in acciones], weights=[w for _, w in acciones])[0]
+            try:
+                accion()
+            except Exception as e:  # el guion del usuario virtual no encontró lo que esperaba
+                self.muestras.append((self.usuario, "guion", 0.0, 0.0, f"{type(e).__name__}: {e}"[:200]))
+            if self.pausa:
+                time.sleep(self.rnd.uniform(0, 2 * self.pausa))
+
+
+def _conteos(db_path):
+    with closing(sqlite3.connect(db_path)) as conn:
+        return {
+            "ots": conn.execute("SELECT COUNT(*) FROM mantenimientos").fetchone()[0],
+            "cerradas": conn.execute("SELECT COUNT(*) FROM mantenimientos WHERE estado = 'Cerrada'").fetchone()[0],
+            "kardex": conn.execute("SELECT COUNT(*) FROM kardex").fetchone()[0],
+        }
+
+
+def _percentil(valores, q):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(q * (len(valores) - 1))))] if valores else 0.0
+
+
+def resumen(muestras):
+    por_accion = {}
+    for usuario, accion, wall, espera, error in muestras:
+        clave = accion.split(" ")[0] if accion.startswith("navegar") else accion
+        por_accion.setdefault(clave, []).append((wall, espera, error))
+    filas = []
+    for accion, datos in sorted(por_accion.items()):
+        walls = [d[0] for d in datos]
+        esperas = [d[1] for d in datos]
+        errores = sum(1 for d in datos if d[2])
+        filas.append({
+            "accion": accion, "n": len(datos),
+            "p50_ms": _percentil(walls, 0.50), "p95_ms": _percentil(walls, 0.95),
+            "p99_ms": _percentil(walls, 0.99), "max_ms": max(walls),
+            "espera_p95_ms": _percentil(esperas, 0.95), "espera_total_ms": sum(esperas),
+            "errores": errores, "tasa_error": errores / len(datos),
+        })
+    return filas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("db", help="archivo .db (usar una copia: la prueba escribe)")
+    ap.add_argument("--usuarios", type=int, default=8, help="sesiones simultáneas")
+    ap.add_argument("--admins", type=int, default=None, help="cuántas son admin (por defecto 1 de cada 3)")
+    ap.add_argument("--duracion", type=float, default=60, help="segundos de carga")
+    ap.add_argument("--pausa", type=float, default=0.2, help="pausa media entre acciones (s)")
+    ap.add_argument("--semilla", type=int, default=7)
+    ap.add_argument("--csv", help="guardar cada rerun medido en este CSV")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        ap.error(f"{args.db} no existe")
+    admins = args.admins if args.admins is not None else max(1, args.usuarios // 3)
+    comun.migrar(args.db)  # esquema al día antes de largar los hilos
+    comun.permitir_sesiones_concurrentes()
+    antes = _conteos(args.db)
+
+    fin = time.monotonic() + args.duracion
+    usuarios = [
+        UsuarioVirtual(i, "admin" if i < admins else "Chiro", args.db, fin, args.pausa, args.semilla + i)
+        for i in range(args.usuarios)
+    ]
+    print(f"🚦 {args.usuarios} usuarios ({admins} admin, {args.usuarios - admins} operarios) durante {args.duracion:.0f}s")
+    t0 = time.perf_counter()
+    for u in usuarios:
+        u.start()
+    for u in usuarios:
+        u.join()
+    total_s = time.perf_counter() - t0
+    despues = _conteos(args.db)
+
+    muestras = [m for u in usuarios for m in u.muestras]
+    print(f"\n{'acción':<20} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'máx':>9} {'espera p95':>11} {'errores':>8}")
+    for r in resumen(muestras):
+        print(
+            f"{r['accion']:<20} {r['n']:>6} {r['p50_ms']:>8.0f}ms {r['p95_ms']:>8.0f}ms {r['p99_ms']:>8.0f}ms "
+            f"{r['max_ms']:>8.0f}ms {r['espera_p95_ms']:>10.0f}ms {r['errores']:>4} ({r['tasa_error']:.0%})"
+        )
+    errores = [m for m in muestras if m[4]]
+    escrituras = (despues["ots"] - antes["ots"]) + (despues["cerradas"] - antes["cerradas"]) + (despues["kardex"] - antes["kardex"])
+    print(
+        f"\nReruns: {len(muestras)} ({len(muestras) / total_s:.1f}/s) | errores: {len(errores)} "
+        f"({len(errores) / max(1, len(muestras)):.1%}) | espera total por el escritor: "
+        f"{sum(m[3] for m in muestras) / 1000:.1f}s"
+    )
+    print(
+        f"Escrituras confirmadas: {escrituras} ({escrituras / total_s:.2f}/s) — OTs nuevas "
+        f"{despues['ots'] - antes['ots']}, cerradas {despues['cerradas'] - antes['cerradas']}, "
+        f"movimientos de kardex {despues['kardex'] - antes['kardex']}"
+    )
+    for mensaje in sorted({m[4] for m in errores})[:5]:
+        print(f"  ❌ {mensaje}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["usuario", "accion", "wall_ms", "espera_escritor_ms", "error"])
+            w.writerows((u, a, round(wall, 1), round(esp, 1), e) for u, a, wall, esp, e in muestras)
+        print(f"💾 {len(muestras)} reruns guardados en {args.csv}")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Utilidades compartidas por las herramientas de línea de comandos (generador, benchmark, carga).
+
+Las herramientas no importan app.py (es un script de Streamlit): lo ejecutan headless con
+streamlit.testing.v1.AppTest, así usan exactamente el mismo código que la app en producción.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import closing, nullcontext
+
+from streamlit import config
+from streamlit.runtime.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.util import build_mock_config_get_option
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+
+USUARIOS = {
+    "admin": "Administrador",
+    "Chiro": "Operario",
+}
+
+
+def compilar_una_vez():
+    """AppTest crea un ScriptCache nuevo en cada run y recompila app.py cada vez; un servidor real
+    lo compila una sola vez. Se comparte el bytecode entre runs (se recompila si cambia el archivo).
+    Además serializa la compilación: ast.parse desde varios hilos a la vez falla en Python 3.11."""
+    if getattr(ScriptCache, "_compilar_una_vez", False):
+        return
+    original = ScriptCache.get_bytecode
+    compilados = {}
+    lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        clave = (os.path.abspath(script_path), os.path.getmtime(script_path))
+        with lock:
+            if clave not in compilados:
+                compilados[clave] = original(self, script_path)
+            return compilados[clave]
+
+    ScriptCache.get_bytecode = get_bytecode
+    ScriptCache._compilar_una_vez = True
+
+
+def permitir_sesiones_concurrentes():
+    """AppTest instala un Runtime simulado al empezar cada run y lo borra (Runtime._instance = None)
+    al terminar: con varias sesiones en hilos, la primera que termina deja sin runtime a las que
+    siguen corriendo. Se hace que Runtime.instance() devuelva el último runtime instalado.
+
+    Lo mismo pasa con la opción global.appTest, que cada run pisa y restaura con mock.patch sobre
+    config.get_option: si un hilo restaura mientras otro corre, los widgets de ese run no guardan
+    su format_func y el árbol queda inservible (KeyError '$$ID-...'). Se fija una sola vez."""
+    if getattr(Runtime, "_sesiones_concurrentes", False):
+        return
+    original = Runtime.instance.__func__
+    ultimo = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            ultimo[:] = [cls._instance]
+            return cls._instance
+        if ultimo:
+            return ultimo[0]
+        return original(cls)
+
+    Runtime.instance = classmethod(instance)
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: nullcontext()
+    Runtime._sesiones_concurrentes = True
+    compilar_una_vez()
+
+
+def nueva_sesion(db_path: str, usuario: str | None = None, timeout: float = 600) -> AppTest:
+    """AppTest apuntado a db_path. Con usuario, la sesión ya queda logueada (sin pasar por el form)."""
+    db_path = os.path.abspath(db_path)
+    if not os.path.exists(db_path):
+        # el selector de la barra lateral descarta rutas que no existen: un archivo vacío es una DB válida
+        sqlite3.connect(db_path).close()
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    at.session_state["db_path"] = db_path
+    at.session_state["init"] = True  # sin auto_backup_db(): copiar una DB de varios GB no es parte de la medición
+    if usuario is not None:
+        at.session_state["login"] = True
+        at.session_state["username"] = usuario
+        at.session_state["role"] = USUARIOS[usuario]
+    return at
+
+
+def migrar(db_path: str) -> int:
+    """Crea/actualiza el esquema de db_path corriendo la app una vez (init + migraciones).
+    Devuelve PRAGMA user_version."""
+    at = nueva_sesion(db_path)
+    at.run()
+    with closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def errores(at: AppTest) -> list:
+    return [e.value for e in at.exception] + [e.value for e in at.error]
+
+
+def radio_navegacion(at: AppTest):
+    for radio in at.sidebar.radio:
+        if radio.label == "Navegación":
+            return radio
+    return None
@@ -0,0 +1,274 @@
+"""Genera una base de datos sintética de flota grande para pruebas de escala.
+
+El esquema sale de correr app.py una vez sobre el archivo nuevo (tablas base + migraciones),
+así es exactamente el mismo que usa la app. Después se llenan las tablas con datos
+parecidos a los reales (fechas repartidas en años, OTs casi todas cerradas, kardex de
+entradas/salidas, cargas de combustible con km y rendimiento, compras y colocaciones
+de cubiertas).
+
+Uso (desde la raíz del repo):
+
+    python herramientas/generar_db_sintetica.py flota_grande.db
+    python herramientas/generar_db_sintetica.py flota_chica.db --escala 0.01
+    python herramientas/generar_db_sintetica.py flota.db --vehiculos 200 --ots 50000 --kardex 0
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import comun  # noqa: E402
+import derivados  # noqa: E402
+
+LOTE = 50_000
+
+CATEGORIAS = [
+    "Mecánica General", "Mecánica Pesada (Motor/Caja)", "Electricidad", "Frenos",
+    "Neumáticos / Gomería", "Carrocería", "Pintura", "Aire Acondicionado",
+    "Sistema de Combustible", "Lavadero", "Servicios / Lubricación", "Conductores",
+    "Reparaciones Generales",
+]
+RESPONSABLES = ["Maxi", "Cristian", "Chofer Asignado", "Taller Externo", "Otro", "Sin asignar"]
+TAREAS = [
+    "Lavado", "Engrase", "Cambio de aceite motor", "Cambio filtro de aceite", "Cambio filtro de aire",
+    "Cambio filtro de combustible", "Cambio pastillas de freno", "Regulación de frenos",
+    "Cambio cinta de freno", "Revisar pérdida de agua", "Cambio de abrazadera manguera radiador",
+    "Cambio de lámparas", "Revisión sistema eléctrico", "Cambio de batería", "Alineación",
+    "Balanceo", "Rotación de cubiertas", "Cambio de cubierta", "Reparación de cámara",
+    "Cambio de amortiguadores", "Cambio de elástico", "Cambio de correa", "Cambio de embrague",
+    "Service caja de cambios", "Service diferencial", "Carga de gas aire acondicionado",
+    "Soldadura chasis", "Pintura de paragolpes", "Cambio de espejo", "Cambio de parabrisas",
+]
+MODELOS_FLOTA = [
+    ("Chasis - Mercedes Benz L 1620 - 4x2", "Chasis"),
+    ("Tractor - Scania R113h 4x2", "Tractor"),
+    ("Tractor - Volvo FH 460 6x2", "Tractor"),
+    ("Chasis - Iveco Tector 170E28", "Chasis"),
+    ("Semirremolque - Helvética 3 ejes", "Semirremolque"),
+    ("Utilitario - Toyota Hilux 4x4", "Utilitario"),
+]
+RUBROS = ["Filtros", "Lubricantes", "Frenos", "Electricidad", "Pinturas", "Bulonería", "Suspensión", "Motor"]
+ARTICULOS = [
+    "FILTRO ACEITE", "FILTRO AIRE", "FILTRO GASOIL", "ACEITE 15W40", "ACEITE 10W40", "PASTILLA FRENO",
+    "CINTA FRENO", "LAMPARA H4", "LAMPARA 1141", "BATERIA 12V", "CORREA POLY V", "ABRAZADERA",
+    "GRASA LITIO", "LIJA NORTON", "ESTOPA", "BULON RUEDA", "TUERCA RUEDA", "AMORTIGUADOR", "ELASTICO",
+    "MANGUERA RADIADOR",
+]
+MARCAS_ARTICULO = ["MANN", "FRAM", "BOSCH", "WEGA", "YPF", "SHELL", "FERODO", "OSRAM", "MOURA", "GATES"]
+MARCAS_CUBIERTA = [("Bridgestone", "R268"), ("Michelin", "X Multi Z"), ("Pirelli", "FR85"),
+                   ("Fate", "Sc-10"), ("Firestone", "FS400"), ("Goodyear", "G677")]
+POSICIONES = ["Dirección", "Tracción", "Eje Loco", "Acoplado"]
+ESTACIONES = ["YPF Ruta 40", "Shell Rawson", "Axion Centro", "YPF Pocito", "Puma Chimbas"]
+NOMBRES = ["JUAN", "FRANCO", "LEONARDO", "EMANUEL", "CRISTIAN", "MAXIMILIANO", "DIEGO", "PABLO", "MARTIN", "JOSE"]
+APELLIDOS = ["SEPEDA", "RAMOS", "VARGAS", "ALE", "GOMEZ", "PEREZ", "DIAZ", "SOSA", "MOLINA", "ROJAS", "LUNA"]
+
+
+def _fechas(n, desde, hasta, rnd):
+    """n fechas ISO ordenadas entre desde y hasta, más densas hacia el final (la flota crece)."""
+    dias = (hasta - desde).days
+    for _ in range(n):
+        yield (desde + timedelta(days=int(dias * (rnd.random() ** 0.7)))).isoformat()
+
+
+def _insertar(conn, tabla, columnas, filas):
+    """executemany por lotes de LOTE filas, un commit por lote. Devuelve cuántas filas insertó."""
+    sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})"
+    total = 0
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= LOTE:
+            conn.executemany(sql, lote)
+            conn.commit()
+            total += len(lote)
+            lote = []
+    if lote:
+        conn.executemany(sql, lote)
+        conn.commit()
+        total += len(lote)
+    return total
+
+
+def generar(destino, n, desde, hasta, semilla=42):
+    rnd = random.Random(semilla)
+    version = comun.migrar(destino)
+    print(f"🗄️ Esquema creado en {destino} (user_version={version})")
+
+    with closing(sqlite3.connect(destino)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")  # carga masiva: si se corta, se vuelve a generar
+        conn.execute("PRAGMA cache_size=-200000")
+
+        def paso(tabla, columnas, filas):
+            t0 = time.perf_counter()
+            cant = _insertar(conn, tabla, columnas, filas)
+            print(f"  {tabla:<24} {cant:>10,} filas  {time.perf_counter() - t0:7.1f}s")
+
+        # --- referencias ---
+        moviles = [str(i) for i in range(1, n["vehiculos"] + 1)]
+        km_iniciales = {m: rnd.randint(50_000, 900_000) for m in moviles}
+        paso("flota", ["id", "nombre_movil", "patente", "modelo", "km_actual", "km_service_interval",
+                       "km_ultimo_service", "tipo", "fecha_actualizacion_km"], (
+            (int(m), m, f"{''.join(rnd.choices('ABCDEFGHJKLMNPRSTUVWXYZ', k=3))} {rnd.randint(0, 999):03d}",
+             modelo, km_iniciales[m], rnd.choice([15_000, 20_000, 30_000]),
+             km_iniciales[m] - rnd.randint(0, 25_000), tipo, hasta.isoformat())
+            for m in moviles
+            for modelo, tipo in [rnd.choice(MODELOS_FLOTA)]
+        ))
+        choferes = [f"{rnd.choice(APELLIDOS)}, {rnd.choice(NOMBRES)} {i}" for i in range(n["choferes"])]
+        paso("choferes", ["nombre", "dni", "telefono", "estado"], (
+            (c, f"{rnd.randint(20, 45)}.{rnd.randint(100, 999)}.{rnd.randint(100, 999)}",
+             f"264{rnd.randint(4000000, 5999999)}", "Activo" if rnd.random() < 0.85 else "Inactivo")
+            for c in choferes
+        ))
+        proveedores = [f"PROVEEDOR {i:04d} S.R.L." for i in range(1, n["proveedores"] + 1)]
+        paso("proveedores", ["empresa", "contacto", "telefono", "direccion", "rubro"], (
+            (p, "", f"264{rnd.randint(4000000, 5999999)}", "San Juan", rnd.choice(RUBROS)) for p in proveedores
+        ))
+        paso("stock", ["codigo", "nombre", "cantidad", "minimo", "precio", "rubro", "proveedor",
+                       "fecha_ingreso", "categoria"], (
+            (f"A{i:06d}", f"{rnd.choice(ARTICULOS)} {rnd.choice(MARCAS_ARTICULO)} {i}", rnd.randint(0, 60),
+             rnd.randint(0, 10), round(rnd.uniform(500, 90_000), 2), rubro, rnd.choice(proveedores),
+             desde.isoformat(), rubro)
+            for i in range(1, n["articulos"] + 1)
+            for rubro in [rnd.choice(RUBROS)]
+        ))
+        paso("tareas_estandar", ["nombre", "activa"], ((t, 1) for t in TAREAS))
+        paso("tareas_alias", ["alias", "tarea_id"], ((t.lower(), i) for i, t in enumerate(TAREAS, 1)))
+
+        # --- tablas grandes ---
+        def ots():
+            for i, fecha in enumerate(sorted(_fechas(n["ots"], desde, hasta, rnd)), 1):
+                tareas = rnd.sample(TAREAS, rnd.randint(1, 3))
+                abierta = rnd.random() < n["abiertas"]
+                externo = rnd.random() < 0.08
+                yield (
+                    i, fecha, rnd.choice(moviles), rnd.choice(choferes), "\n".join(tareas),
+                    "Aceite:False, Frenos:False, Luces:False, Neu:False",
+                    rnd.choice(["Pendiente", "En Proceso"]) if abierta else "Cerrada",
+                    rnd.choice(CATEGORIAS), "Taller Externo" if externo else rnd.choice(RESPONSABLES),
+                    round(rnd.uniform(20_000, 800_000), 2) if externo else 0.0,
+                    rnd.choice(proveedores) if externo else None,
+                    None if abierta else fecha, fecha,
+                )
+
+        paso("mantenimientos", ["id", "fecha", "movil", "chofer", "descripcion", "checklist", "estado",
+                                "categoria", "responsable", "costo_terceros", "proveedor_taller",
+                                "fecha_cierre", "fecha_creacion"], ots())
+        n_ots = n["ots"]
+        if n_ots:
+            paso("ot_tareas", ["ot_id", "tarea_id", "detalle", "fecha", "usuario"], (
+                (rnd.randint(1, n_ots), rnd.randint(1, len(TAREAS)), None, fecha, "Chiro")
+                for fecha in _fechas(int(n_ots * n["tareas_por_ot"]), desde, hasta, rnd)
+            ))
+            paso("ot_repuestos", ["ot_id", "stock_id", "nombre", "cantidad", "fecha", "usuario", "estado"], (
+                (rnd.randint(1, n_ots), rnd.randint(1, max(1, n["articulos"])), rnd.choice(ARTICULOS),
+                 rnd.randint(1, 4), fecha, "Chiro", "Entregado" if rnd.random() < 0.95 else "Solicitado")
+                for fecha in _fechas(int(n_ots * n["repuestos_por_ot"]), desde, hasta, rnd)
+            ))
+
+        def kardex():
+            for fecha in _fechas(n["kardex"], desde, hasta, rnd):
+                entrada = rnd.random() < 0.35
+                yield (
+                    rnd.randint(1, max(1, n["articulos"])), fecha, "ENTRADA" if entrada else "SALIDA",
+                    rnd.randint(1, 24) if entrada else rnd.randint(1, 4), rnd.choice(["admin", "Chiro"]),
+                    rnd.choice(proveedores) if entrada else None,
+                    None if entrada else (rnd.choice(moviles) if rnd.random() < 0.8 else "Uso interno"),
+                )
+
+        paso("kardex", ["id_articulo", "fecha", "tipo_movimiento", "cantidad", "usuario", "proveedor", "destino"],
+             kardex())
+
+        def cargas():
+            km = dict(km_iniciales)
+            for fecha in sorted(_fechas(n["combustible"], desde, hasta, rnd)):
+                movil = rnd.choice(moviles)
+                litros = round(rnd.uniform(80, 450), 1)
+                kms = int(litros * rnd.uniform(2.2, 3.4))
+                km[movil] += kms
+                precio = 300 + 1_200 * (date.fromisoformat(fecha) - desde).days / max(1, (hasta - desde).days)
+                yield (fecha, movil, rnd.choice(choferes), litros, round(litros * precio, 2), km[movil], kms,
+                       rnd.choice(ESTACIONES), round(kms / litros, 2), round(precio, 2))
+
+        paso("combustible", ["fecha", "movil", "chofer", "litros", "costo", "km_momento", "kilometros",
+                             "proveedor", "rendimiento", "costo_litro"], cargas())
+
+        def cubiertas():
+            for fecha in _fechas(n["cubiertas"], desde, hasta, rnd):
+                marca, modelo = rnd.choice(MARCAS_CUBIERTA)
+                if rnd.random() < 0.45:
+                    yield (fecha, "ENTRADA", f"C-{modelo}", marca, modelo, rnd.randint(2, 12),
+                           round(rnd.uniform(150_000, 650_000), 2), f"A-{rnd.randint(1, 99_999):05d}",
+                           rnd.choice(proveedores), None, None, None, None, None)
+                else:
+                    movil = rnd.choice(moviles)
+                    fuego = rnd.randint(100, 99_999)
+                    yield (fecha, "SALIDA", None, marca, modelo, rnd.choice([1, 2, 2, 4]), None, None, None,
+                           movil, f"{fuego}-{fuego + 1}", rnd.choice(POSICIONES),
+                           km_iniciales[movil] + rnd.randint(0, 300_000), None)
+
+        paso("cubiertas_movimientos", ["fecha", "tipo_movimiento", "codigo_producto", "marca", "modelo",
+                                       "cantidad", "precio_unitario", "nro_factura", "proveedor",
+                                       "destino_camion", "nro_interno", "ubicacion_posicion",
+                                       "kilometraje_colocacion", "observaciones"], cubiertas())
+
+        # km_actual final = último km cargado en combustible (como lo deja el form de carga)
+        conn.execute(
+            "UPDATE flota SET km_actual = COALESCE((SELECT MAX(km_momento) FROM combustible c "
+            "WHERE c.movil = flota.nombre_movil), km_actual)"
+        )
+        # el estado por Nº de fuego no lo mantienen triggers: se arma como lo hace la app al grabar
+        t0 = time.perf_counter()
+        aplicados = derivados.reconstruir_neumaticos(conn)
+        print(f"  {'neumaticos':<24} {aplicados:>10,} movs.  {time.perf_counter() - t0:7.1f}s")
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("destino", help="archivo .db a crear")
+    ap.add_argument("--escala", type=float, default=1.0, help="multiplica todas las cantidades (p. ej. 0.01)")
+    ap.add_argument("--vehiculos", type=int, default=1_000)
+    ap.add_argument("--choferes", type=int, default=400)
+    ap.add_argument("--proveedores", type=int, default=150)
+    ap.add_argument("--articulos", type=int, default=3_000)
+    ap.add_argument("--ots", type=int, default=1_000_000)
+    ap.add_argument("--tareas-por-ot", type=float, default=1.8)
+    ap.add_argument("--repuestos-por-ot", type=float, default=0.6)
+    ap.add_argument("--abiertas", type=float, default=0.02, help="fracción de OTs sin cerrar")
+    ap.add_argument("--kardex", type=int, default=5_000_000)
+    ap.add_argument("--combustible", type=int, default=2_000_000)
+    ap.add_argument("--cubiertas", type=int, default=500_000)
+    ap.add_argument("--desde", type=date.fromisoformat, default=date(2015, 1, 1))
+    ap.add_argument("--hasta", type=date.fromisoformat, default=date.today())
+    ap.add_argument("--semilla", type=int, default=42)
+    ap.add_argument("--forzar", action="store_true", help="pisar el destino si existe")
+    args = ap.parse_args(argv)
+
+    if os.path.exists(args.destino):
+        if not args.forzar:
+            ap.error(f"{args.destino} ya existe (usar --forzar para pisarlo)")
+        for sufijo in ("", "-wal", "-shm"):
+            if os.path.exists(args.destino + sufijo):
+                os.remove(args.destino + sufijo)
+
+    cantidades = {
+        k: max(1, int(getattr(args, k) * args.escala)) if getattr(args, k) else 0
+        for k in ("vehiculos", "choferes", "proveedores", "articulos", "ots", "kardex", "combustible", "cubiertas")
+    }
+    cantidades.update(tareas_por_ot=args.tareas_por_ot, repuestos_por_ot=args.repuestos_por_ot, abiertas=args.abiertas)
+    t0 = time.perf_counter()
+    generar(args.destino, cantidades, args.desde, args.hasta, args.semilla)
+    print(f"✅ {args.destino}: {os.path.getsize(args.destino) / 2**20:,.1f} MB en {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
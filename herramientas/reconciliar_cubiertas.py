@@ -0,0 +1,61 @@
+"""Reconcilia el saldo de cubiertas (cubiertas_saldo) con el historial de movimientos.
+
+El saldo por marca y modelo lo mantienen triggers en cada ENTRADA/SALIDA; si se cargaron
+movimientos con los triggers borrados o se editó la base con otra herramienta, puede quedar
+desviado. Esto hace lo mismo que el botón "🔁 Reconciliar saldo" de ⚡ RENDIMIENTO, que además
+rearma el estado de cada cubierta por Nº de fuego (neumaticos) repasando el historial. Usa una
+conexión sqlite3 común (sin levantar la app).
+
+Uso (desde la raíz del repo):
+
+    python herramientas/reconciliar_cubiertas.py chiro_master_v67.db
+    python herramientas/reconciliar_cubiertas.py chiro_master_v67.db --verificar   # sólo informa
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import derivados  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("db", help="archivo .db")
+    ap.add_argument("--verificar", action="store_true", help="sólo comparar el saldo con el historial")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        ap.error(f"{args.db} no existe")
+    with closing(sqlite3.connect(args.db, timeout=30)) as conn:
+        tablas = {f[0] for f in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {"cubiertas_saldo", "neumaticos_eventos"} <= tablas:
+            print("❌ La base no tiene cubiertas_saldo/neumaticos_eventos: abrila una vez con la app para que se migre")
+            return 1
+        if args.verificar:
+            desvio = derivados.desvio_cubiertas(conn)
+        else:
+            conn.execute("BEGIN IMMEDIATE")
+            desvio = derivados.reconciliar_cubiertas(conn)
+            aplicados = derivados.reconstruir_neumaticos(conn)
+            conn.commit()
+
+    for d in desvio:
+        print(f"{d['marca']} {d['modelo']:<30} saldo={d['stock_saldo']}  real={d['stock_real']}")
+    if args.verificar:
+        print(
+            f"⚠️ {len(desvio)} modelo(s) con saldo desviado del historial" if desvio
+            else "✅ El saldo coincide con el historial de movimientos"
+        )
+    else:
+        print(
+            f"✅ Saldo de cubiertas reconciliado ({len(desvio)} modelo(s) corregido(s)); "
+            f"estado por Nº de fuego rearmado con {aplicados} movimiento(s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Reconstruye los KPIs del tablero (kpi_snapshot / kpi_stock_rubros) de una base.
+
+Los KPIs los mantienen triggers en cada escritura; si alguien cargó datos con los triggers
+borrados, restauró tablas sueltas o editó la base con otra herramienta, el snapshot puede
+quedar desviado. Esto hace lo mismo que el botón "🔁 Reconstruir KPIs" de ⚡ RENDIMIENTO,
+con una conexión sqlite3 común (sin levantar la app).
+
+Uso (desde la raíz del repo):
+
+    python herramientas/reconstruir_kpis.py chiro_master_v67.db
+    python herramientas/reconstruir_kpis.py chiro_master_v67.db --verificar   # sólo informa
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import derivados  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("db", help="archivo .db")
+    ap.add_argument("--verificar", action="store_true", help="sólo comparar el snapshot con las tablas")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        ap.error(f"{args.db} no existe")
+    with closing(sqlite3.connect(args.db, timeout=30)) as conn:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'kpi_snapshot'").fetchone() is None:
+            print("❌ La base no tiene kpi_snapshot: abrila una vez con la app para que se migre")
+            return 1
+        if args.verificar:
+            desvio = derivados.desvio_kpis(conn)
+        else:
+            conn.execute("BEGIN IMMEDIATE")
+            desvio = derivados.reconstruir_kpis(conn)
+            conn.commit()
+
+    for kpi, (snapshot, real) in desvio.items():
+        print(f"{kpi:<20} snapshot={snapshot}  real={real}")
+    if args.verificar:
+        print(f"⚠️ {len(desvio)} KPI(s) desviados del valor real" if desvio else "✅ El snapshot coincide con las tablas")
+    else:
+        print(f"✅ KPIs reconstruidos ({len(desvio)} corregido(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Endpoint local que imita generateContent de Gemini, para probar y medir la IA sin red.
+
+Contesta en el mismo formato que el modelo (candidates[0].content.parts[0].text con un array
+JSON): para texto, un ítem por renglón del dictado; para imágenes, una descripción genérica.
+Se le puede agregar latencia y una fracción de respuestas 503/429 para ejercitar los reintentos.
+Al cortarlo (Ctrl+C) informa pedidos, conexiones abiertas (con keep-alive son muchas menos que
+los pedidos), errores simulados y latencia servida.
+
+Uso (desde la raíz del repo):
+
+    python herramientas/stub_ia.py --puerto 8765 --latencia 0.4 --fallas 0.1
+    CHIRO_IA_CLAVE=stub CHIRO_IA_URL=http://127.0.0.1:8765/v1beta/models/stub:generateContent streamlit run app.py
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOVIL = re.compile(r"\b(?:m[oó]vil|interno|unidad)\s*(\w+)", re.IGNORECASE)
+
+
+class Estadisticas:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pedidos = 0
+        self.conexiones = 0
+        self.fallas = 0
+        self.latencias = []
+
+    def sumar(self, campo, n=1):
+        with self.lock:
+            setattr(self, campo, getattr(self, campo) + n)
+
+
+def respuesta_texto(texto: str) -> list:
+    """Un ítem por renglón no vacío del dictado (lo que sigue al prompt)."""
+    renglones = [r.strip(" -•\t") for r in texto.splitlines()]
+    items = []
+    for renglon in renglones:
+        if not renglon or renglon.startswith(("Eres ", "[{", "Si no")):
+            continue
+        movil = MOVIL.search(renglon)
+        items.append({
+            "descripcion": renglon[:200],
+            "repuesto": "",
+            "cantidad": 1,
+            "movil": movil.group(1) if movil else "",
+        })
+    return items or [{"descripcion": "Sin novedades", "repuesto": "", "cantidad": 1, "movil": ""}]
+
+
+def crear_handler(args, stats, rnd):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, como el endpoint real
+
+        def setup(self):
+            super().setup()
+            stats.sumar("conexiones")
+
+        def log_message(self, *a):
+            if args.verbose:
+                super().log_message(*a)
+
+        def _responder(self, codigo, cuerpo, extra=None):
+            datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(datos)))
+            for k, v in (extra or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_POST(self):
+            t0 = time.perf_counter()
+            pedido = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            stats.sumar("pedidos")
+            with stats.lock:
+                demora = max(0.0, rnd.gauss(args.latencia, args.latencia / 4)) if args.latencia else 0.0
+                falla = rnd.random() < args.fallas
+            time.sleep(demora)
+            if falla:
+                stats.sumar("fallas")
+                codigo = 429 if rnd.random() < 0.5 else 503
+                self._responder(codigo, {"error": {"code": codigo, "message": "stub: falla simulada"}},
+                                {"Retry-After": "0"} if codigo == 429 else None)
+                return
+            partes = pedido.get("contents", [{}])[0].get("parts", [])
+            if any("inline_data" in p for p in partes):
+                items = [{"descripcion": "Imagen recibida (stub): sin fallas detectadas", "repuesto": "", "cantidad": 1}]
+            else:
+                items = respuesta_texto("\n".join(p.get("text", "") for p in partes))
+            texto = "```json\n" + json.dumps(items, ensure_ascii=False) + "\n```"
+            self._responder(200, {"candidates": [{"content": {"parts": [{"text": texto}]}}]})
+            with stats.lock:
+                stats.latencias.append((time.perf_counter() - t0) * 1000)
+
+    return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--puerto", type=int, default=8765)
+    ap.add_argument("--latencia", type=float, default=0.3, help="segundos por respuesta (media)")
+    ap.add_argument("--fallas", type=float, default=0.0, help="fracción de respuestas 503/429 (0-1)")
+    ap.add_argument("--semilla", type=int, default=7)
+    ap.add_argument("--verbose", action="store_true", help="loguear cada pedido")
+    args = ap.parse_args(argv)
+
+    stats = Estadisticas()
+    servidor = ThreadingHTTPServer(("127.0.0.1", args.puerto), crear_handler(args, stats, random.Random(args.semilla)))
+    servidor.daemon_threads = True
+    print(f"🤖 Stub de IA en http://127.0.0.1:{args.puerto}/v1beta/models/stub:generateContent "
+          f"(latencia {args.latencia}s, fallas {args.fallas:.0%}). Ctrl+C para terminar.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    lat = sorted(stats.latencias)
+    p50 = lat[len(lat) // 2] if lat else 0.0
+    print(f"\nPedidos: {stats.pedidos} · conexiones: {stats.conexiones} · fallas simuladas: {stats.fallas} "
+          f"· latencia servida p50 {p50:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
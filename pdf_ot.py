@@ -0,0 +1,233 @@
+"""PDF de una orden de trabajo (diseño ejecutivo) y render por lotes.
+
+Está fuera de app.py porque la exportación masiva renderiza en procesos aparte: los workers
+importan sólo este módulo (fpdf, sin Streamlit ni la base) y reciben cada OT como un dict.
+"""
+import io
+import zipfile
+from datetime import date
+
+from fpdf import FPDF
+
+# Subir cuando cambia el diseño del PDF
+PLANTILLA_VERSION = 4
+
+# Registradas siempre en el mismo orden: /F1, /F2, /F3 son las mismas fuentes en todos los
+# documentos, así las páginas que arman distintos procesos se pueden juntar en un solo PDF.
+FUENTES = (("Arial", "B"), ("Arial", ""), ("Arial", "I"))
+
+
+def pdf_safe(txt):
+    """FPDF (pyfpdf) usa latin-1: sanitizamos texto para evitar errores (•, comillas raras, emojis)."""
+    if txt is None:
+        return ""
+    s = str(txt)
+    # reemplazos comunes
+    s = s.replace("•", "- ").replace("\u2022", "- ")
+    s = s.replace("–", "-").replace("—", "-")
+    s = s.replace("“", '"').replace("”", '"').replace("’", "'").replace("‘", "'")
+    # forzar latin-1
+    return s.encode("latin-1", "replace").decode("latin-1")
+
+
+class DocumentoOT(FPDF):
+    """FPDF con la salida en una lista de partes: el original hace buffer += línea, que es
+    cuadrático y en un PDF unido de miles de páginas se lleva casi todo el tiempo."""
+
+    @property
+    def buffer(self):
+        return "".join(self._partes)
+
+    @buffer.setter
+    def buffer(self, valor):
+        self._partes = [valor] if valor else []
+        self._largo = len(valor)
+
+    def _out(self, s):
+        if self.state == 2:  # contenido de la página en curso: como siempre
+            return super()._out(s)
+        if isinstance(s, bytes):
+            s = s.decode("latin1")
+        elif not isinstance(s, str):
+            s = str(s)
+        self._partes.append(s + "\n")
+        self._largo += len(s) + 1
+
+    def _newobj(self):
+        self.n += 1
+        self.offsets[self.n] = self._largo
+        self._out(f"{self.n} 0 obj")
+
+
+def nuevo_documento() -> FPDF:
+    pdf = DocumentoOT()
+    for familia, estilo in FUENTES:
+        pdf.set_font(familia, estilo)
+    return pdf
+
+
+def salida(pdf: FPDF) -> bytes:
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def _dia(valor) -> str:
+    """'2026-03-05' (o con hora) -> '05/03/2026'; lo que no tenga esa forma, tal cual."""
+    try:
+        return date.fromisoformat(str(valor or "")[:10]).strftime("%d/%m/%Y")
+    except ValueError:
+        return pdf_safe(valor)
+
+
+def fecha_encabezado(ot: dict) -> str:
+    """La fecha del encabezado sale de la OT y no del día del render: el PDF queda en el caché y se
+    vuelve a servir tal cual. Cerrada: el día del cierre; si no (u OTs viejas sin fecha_cierre), la de la OT."""
+    if ot.get("estado") == "Cerrada" and ot.get("fecha_cierre"):
+        return f"Cerrada el {_dia(ot['fecha_cierre'])}"
+    return f"Orden del {_dia(ot['fecha'])}" if ot.get("fecha") else ""
+
+
+def dibujar_ot(pdf: FPDF, ot: dict, tareas=(), repuestos=()):
+    """Agrega al documento las páginas de una OT. tareas: [(nombre, detalle)] de ot_tareas;
+    repuestos: [(nombre, cantidad, estado)] de ot_repuestos (sin ellos, la columna repuesto)."""
+    pdf.add_page()
+
+    # Encabezado con fondo gris claro
+    pdf.set_fill_color(240, 240, 240)  # Gris claro
+    pdf.rect(0, 0, 210, 40, "F")  # Rectángulo de fondo
+
+    # Datos de la empresa formales
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_xy(10, 8)
+    pdf.cell(0, 8, "TRANSPORTE CHIRO S.R.L.", 0, 1, "L")
+    pdf.set_font("Arial", "", 9)
+    pdf.set_xy(10, 15)
+    pdf.cell(0, 6, "Sistema de Gestión de Mantenimiento", 0, 1, "L")
+    pdf.set_xy(10, 21)
+    pdf.cell(0, 6, fecha_encabezado(ot), 0, 1, "L")
+
+    # Título alineado a la derecha
+    pdf.set_font("Arial", "B", 18)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_xy(10, 30)
+    pdf.cell(0, 10, f"ORDEN DE TRABAJO N° {ot['id']}", 0, 1, "R")
+
+    # Línea separadora
+    pdf.set_draw_color(200, 200, 200)
+    pdf.line(10, 45, 200, 45)
+
+    pdf.ln(15)
+
+    # Información de la OT
+    pdf.set_font("Arial", "B", 11)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 8, "INFORMACIÓN DE LA ORDEN", 0, 1, "L")
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 6, pdf_safe(f"Móvil: {ot['movil']}"), 0, 1, "L")
+    pdf.cell(0, 6, pdf_safe(f"Chofer: {ot['chofer']}"), 0, 1, "L")
+    pdf.cell(0, 6, pdf_safe(f"Fecha: {ot['fecha']}"), 0, 1, "L")
+    pdf.cell(0, 6, pdf_safe(f"Estado: {ot['estado']}"), 0, 1, "L")
+
+    pdf.ln(8)
+
+    # Trabajo realizado
+    pdf.set_font("Arial", "B", 11)
+    pdf.cell(0, 8, "TRABAJO REALIZADO:", 0, 1, "L")
+    pdf.set_font("Arial", "", 10)
+    pdf.multi_cell(0, 6, pdf_safe(f"{ot['descripcion']}"))
+
+    # Tareas del catálogo cargadas en la OT
+    if tareas:
+        pdf.ln(5)
+        pdf.set_font("Arial", "B", 11)
+        pdf.cell(0, 8, "TAREAS:", 0, 1, "L")
+        pdf.set_font("Arial", "", 10)
+        for nombre, detalle in tareas:
+            pdf.multi_cell(0, 6, pdf_safe(f"- {nombre}" + (f" ({detalle})" if detalle else "")))
+
+    # Checklist si existe
+    if ot.get("checklist") and str(ot["checklist"]).strip():
+        pdf.ln(5)
+        pdf.set_font("Arial", "B", 11)
+        pdf.cell(0, 8, "CHECKLIST:", 0, 1, "L")
+        pdf.set_font("Arial", "I", 9)
+        pdf.multi_cell(0, 6, pdf_safe(f"{ot['checklist']}"))
+
+    # Repuestos si existen (los de ot_repuestos; las OTs viejas sólo tienen la columna repuesto)
+    if not repuestos and ot.get("repuesto") and str(ot["repuesto"]).strip():
+        repuestos = [(str(ot["repuesto"]).strip(), ot.get("cantidad", 0) or 0, "-")]
+    if repuestos:
+        pdf.ln(8)
+        pdf.set_font("Arial", "B", 11)
+        pdf.cell(0, 8, "REPUESTOS UTILIZADOS:", 0, 1, "L")
+
+        # Tabla simple de repuestos
+        pdf.set_font("Arial", "B", 9)
+        pdf.set_fill_color(220, 220, 220)
+        pdf.cell(120, 7, "Repuesto", 1, 0, "L", True)
+        pdf.cell(30, 7, "Cantidad", 1, 0, "C", True)
+        pdf.cell(40, 7, "Observaciones", 1, 1, "L", True)
+
+        pdf.set_font("Arial", "", 9)
+        pdf.set_fill_color(255, 255, 255)
+        for nombre, cantidad, estado in repuestos:
+            pdf.cell(120, 6, pdf_safe(nombre), 1, 0, "L", True)
+            pdf.cell(30, 6, str(cantidad or 0), 1, 0, "C", True)
+            pdf.cell(40, 6, pdf_safe(estado or "-"), 1, 1, "L", True)
+
+    # Costo total
+    if ot.get("costo_total") and ot["costo_total"] > 0:
+        pdf.ln(10)
+        pdf.set_font("Arial", "B", 12)
+        pdf.set_fill_color(240, 240, 240)
+        pdf.cell(0, 10, f"COSTO TOTAL: ${ot['costo_total']:,.2f}", 0, 1, "R", True)
+
+    # Pie de página
+    pdf.set_y(-15)
+    pdf.set_font("Arial", "I", 8)
+    pdf.set_text_color(128, 128, 128)
+    pdf.cell(0, 10, "Documento generado automáticamente por Transporte Chiro SRL", 0, 0, "C")
+
+
+def render_ot(ot: dict, tareas=(), repuestos=()) -> bytes:
+    pdf = nuevo_documento()
+    dibujar_ot(pdf, ot, tareas, repuestos)
+    return salida(pdf)
+
+
+def render_lote(lote, unido: bool) -> list:
+    """Lo corre un worker. lote: [(ot, tareas, repuestos)]. Devuelve [(ot_id, pdf, paginas)]: con
+    unido=True "pdf" es la lista de contenidos de página (para unir() en el proceso principal),
+    si no los bytes."""
+    salidas = []
+    for ot, tareas, repuestos in lote:
+        pdf = nuevo_documento()
+        dibujar_ot(pdf, ot, tareas, repuestos)
+        if unido:
+            salidas.append((ot["id"], [pdf.pages[n] for n in range(1, pdf.page + 1)], pdf.page))
+        else:
+            salidas.append((ot["id"], salida(pdf), pdf.page))
+    return salidas
+
+
+def contar_paginas(datos: bytes) -> int:
+    """Páginas de un PDF de este módulo (FPDF escribe un "<</Type /Page" por página)."""
+    return datos.count(b"<</Type /Page\n")
+
+
+def unir(paginas) -> bytes:
+    """Un PDF con los contenidos de página que devolvió render_lote(unido=True), en orden."""
+    pdf = nuevo_documento()
+    for contenido in paginas:
+        pdf.add_page()
+        pdf.pages[pdf.page] = contenido
+    return salida(pdf)
+
+
+def comprimir(archivos) -> bytes:
+    """ZIP con [(nombre, bytes)]: los PDF ya vienen comprimidos, se guardan tal cual."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as z:
+        for nombre, datos in archivos:
+            z.writestr(nombre, datos)
+    return buf.getvalue()